@@ -9,6 +9,8 @@ Usage:
 Environment variables required:
     DATABASE_URL - Neon PostgreSQL connection string
     BROWSERLESS_URL - (optional) Browserless.io WebSocket endpoint
+    CHROME_CDP_URL - (optional) DevTools URL of an already running Chrome
+    SERPAPI_KEY - (optional) SerpAPI key; searches via its API instead of a browser
 
 Install dependencies:
     uv sync
@@ -17,14 +19,18 @@ Install dependencies:
 
 import os
 import re
-import hashlib
+import json
 import logging
 import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from urllib.parse import quote_plus, urlparse, parse_qs
-import random
 
-import psycopg2
+import httpx
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 from dotenv import load_dotenv
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
@@ -35,11 +41,21 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+# httpx logs every request URL at INFO, which would include the SerpAPI key
+logging.getLogger('httpx').setLevel(logging.WARNING)
 
 # Configuration
 DEFAULT_SEARCH_QUERY = '(site:jobs.ashbyhq.com OR site:greenhouse.io OR site:jobs.lever.co OR site:jobs.smartrecruiters.com OR site:wd1.myworkdayjobs.com OR site:jobs.bamboohr.com OR site:jobs.jobvite.com OR site:careers.icims.com OR site:apply.jazz.co OR site:careers.workable.com) ("front-end" OR "frontend" OR "fullstack" OR "product") remote'
 SEARCH_QUERY = os.getenv('SEARCH_QUERY', DEFAULT_SEARCH_QUERY)
-MAX_PAGES = 10  # Max search result pages to scrape
+RESULTS_PER_PAGE = 100  # Google's num= parameter
+MAX_PAGES = 3  # Max search result pages to scrape
+GOOGLE_PAGE_SIZE = 10  # Results per page when Google ignores num=
+FALLBACK_MAX_PAGES = 10  # Max pages to scrape at GOOGLE_PAGE_SIZE
+MAX_CONCURRENT_PAGES = 3  # Result pages fetched in parallel
+CHECKPOINT_FILE = 'checkpoint.json'  # Pages saved so far, for resuming failed runs
+CHECKPOINT_MAX_AGE = 3 * 60 * 60  # Seconds a failed run's checkpoint stays resumable
+MAX_BLOCKED_RETRIES = 5  # Retries per page when Google serves a CAPTCHA / 429
+COPY_THRESHOLD = 100  # Batches at least this large (a full num=100 page, a SerpAPI run) use COPY
 
 JOB_DOMAINS = (
     'jobs.ashbyhq.com',
@@ -54,6 +70,85 @@ JOB_DOMAINS = (
     'careers.workable.com',
 )
 
+# Present once a results page is usable
+RESULTS_SELECTOR = '#search, #rso, textarea[name=q]'
+
+ASHBY_COMPANY_RE = re.compile(r'jobs\.ashbyhq\.com/([^/]+)')
+
+# Google's "unusual traffic" interstitial
+CAPTCHA_SELECTOR = 'form#captcha-form, div#recaptcha'
+
+# Google's consent wall: the consent.google.com form or the in-page dialog
+CONSENT_CONTAINER = 'form[action*="consent"], div[role="dialog"]'
+
+# Consent/cookie popup buttons inside CONSENT_CONTAINER, in priority order
+# (covers multiple languages)
+CONSENT_SELECTORS = [
+    # English
+    'button:has-text("Accept all")',
+    'button:has-text("Accept")',
+    'button:has-text("I agree")',
+    'button:has-text("Agree")',
+    'button:has-text("Allow all")',
+    'button:has-text("Allow")',
+    'button:has-text("Got it")',
+    'button:has-text("OK")',
+    # Polish
+    'button:has-text("Zaakceptuj wszystko")',
+    'button:has-text("Akceptuję")',
+    'button:has-text("Zgadzam się")',
+    # Generic selectors
+    'button[id*="accept"]',
+    'button[aria-label*="Accept"]',
+    '.QS5gu.sy4vM',  # Google's consent button class
+    'button:first-of-type',
+]
+# Any visible consent button - lets one wait cover every selector
+CONSENT_SELECTOR = ', '.join(f'{selector}:visible' for selector in CONSENT_SELECTORS)
+
+# Resources the scraper never reads; dropping them speeds up page loads
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media', 'stylesheet'}
+
+# Shared by every fresh browser context
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'locale': 'en-US',
+    'timezone_id': 'America/New_York',
+}
+
+# Injected into every browser context to hide common automation fingerprints
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+    Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
+    Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
+    window.chrome = { runtime: {} };
+"""
+
+# Collects href/h3/text/snippet for every link mentioning a job domain in one
+# DOM pass; exact domain validation happens in Python after redirect unwrapping.
+# The snippet is read from the link's result container, not by walking parents.
+EXTRACT_LINKS_SCRIPT = """
+(domains) => Array.from(document.querySelectorAll('a[href]'))
+    .filter(a => domains.some(d => a.href.includes(d)))
+    .map(a => {
+        const h3 = a.querySelector('h3');
+        const result = a.closest('div.g, div.tF2Cxc');
+        const snippet = result && result.querySelector('div.VwiC3b, span.aCOpRe, div[data-sncf]');
+        return {
+            href: a.getAttribute('href'),
+            title: h3 ? h3.textContent : '',
+            text: a.textContent || '',
+            snippet: snippet ? snippet.textContent : '',
+        };
+    })
+"""
+
+# Organic result count and whether a next page exists, for detecting an ignored num=
+PAGE_INFO_SCRIPT = """
+() => [document.querySelectorAll('#search a h3').length, !!document.querySelector('a#pnnext')]
+"""
+
 
 def is_valid_job_url(url: str) -> bool:
     """Return True only if url's hostname matches one of the allowed job board domains."""
@@ -63,11 +158,40 @@ def is_valid_job_url(url: str) -> bool:
     except Exception:
         return False
 
+
+def normalize_url(url: str) -> str:
+    """Key identifying a job URL; must match the idx_jobs_url_normalized expression."""
+    return url.lower().rstrip('/')
+
+
+def ignored_num(organic: int, has_next: bool) -> bool:
+    """Return True if Google ignored num= and served a default-size first page.
+    
+    A first page somewhat short of RESULTS_PER_PAGE (similar results omitted)
+    still means num= was honored, so paging keeps stepping by RESULTS_PER_PAGE.
+    Shared by the browser and SerpAPI paths.
+    """
+    return has_next and organic <= GOOGLE_PAGE_SIZE
+
+
+def dedupe_jobs(jobs: list[dict]) -> list[dict]:
+    """Filter valid job board URLs, deduplicate by normalized URL and re-rank from 1."""
+    by_url = {}
+    for job in jobs:
+        url = job['url']
+        if not is_valid_job_url(url):
+            continue
+        by_url[normalize_url(url)] = job  # last wins
+    unique_jobs = list(by_url.values())
+    for rank, job in enumerate(unique_jobs, 1):
+        job['search_rank'] = rank  # Re-assign rank after filtering
+    return unique_jobs
+
+
 DB_SCHEMA = """
 CREATE TABLE IF NOT EXISTS jobs (
     id SERIAL PRIMARY KEY,
-    url TEXT UNIQUE NOT NULL,
-    url_hash VARCHAR(64) UNIQUE NOT NULL,
+    url TEXT NOT NULL,
     title TEXT,
     company TEXT,
     description TEXT,
@@ -77,38 +201,73 @@ CREATE TABLE IF NOT EXISTS jobs (
     is_active BOOLEAN DEFAULT TRUE
 );
 
-CREATE INDEX IF NOT EXISTS idx_jobs_url_hash ON jobs(url_hash);
-CREATE INDEX IF NOT EXISTS idx_jobs_discovered_at ON jobs(discovered_at);
-CREATE INDEX IF NOT EXISTS idx_jobs_search_rank ON jobs(search_rank);
+-- Jobs are unique by normalized URL (lowercased, no trailing slash), which is
+-- what the old url_hash column encoded; the plain url constraint is subsumed
+ALTER TABLE jobs DROP COLUMN IF EXISTS url_hash;
+ALTER TABLE jobs DROP CONSTRAINT IF EXISTS jobs_url_key;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_url_normalized ON jobs(lower(rtrim(url, '/')));
+
+-- Only active jobs are ever read by discovery date; nothing queries by search_rank
+DROP INDEX IF EXISTS idx_jobs_discovered_at;
+DROP INDEX IF EXISTS idx_jobs_search_rank;
+CREATE INDEX IF NOT EXISTS idx_jobs_active_recent ON jobs(discovered_at DESC) WHERE is_active = TRUE;
+"""
+
+# Shared by both save_jobs paths: refresh rank/last_seen on existing rows and
+# report whether each row was newly inserted
+UPSERT_CONFLICT_SQL = """
+ON CONFLICT (lower(rtrim(url, '/'))) DO UPDATE SET
+    title = EXCLUDED.title,
+    description = EXCLUDED.description,
+    search_rank = EXCLUDED.search_rank,
+    last_seen_at = CURRENT_TIMESTAMP,
+    is_active = TRUE
+RETURNING (xmax = 0) AS inserted, title, company, search_rank
 """
 
 
-def get_db_connection():
-    """Create database connection from DATABASE_URL env var."""
-    db_url = os.getenv('DATABASE_URL')
-    if not db_url:
-        raise ValueError("DATABASE_URL environment variable not set")
-    return psycopg2.connect(db_url)
+_POOL = None
 
 
-def init_db():
-    """Initialize database schema."""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(DB_SCHEMA)
-        conn.commit()
-    logger.info("Database initialized")
+async def _get_pool() -> AsyncConnectionPool:
+    """Open the connection pool from DATABASE_URL env var on first use."""
+    global _POOL
+    if _POOL is None:
+        db_url = os.getenv('DATABASE_URL')
+        if not db_url:
+            raise ValueError("DATABASE_URL environment variable not set")
+        _POOL = AsyncConnectionPool(db_url, min_size=1, max_size=4, open=False)
+        await _POOL.open()
+    return _POOL
+
 
+async def close_db_pool():
+    """Close the connection pool if it was opened."""
+    global _POOL
+    if _POOL is not None:
+        await _POOL.close()
+        _POOL = None
 
-def hash_url(url: str) -> str:
-    """Create consistent hash for URL deduplication."""
-    normalized = url.lower().rstrip('/')
-    return hashlib.sha256(normalized.encode()).hexdigest()
+
+@asynccontextmanager
+async def get_db_connection():
+    """Borrow a pooled connection; commits on success, rolls back on error."""
+    pool = await _get_pool()
+    async with pool.connection() as conn:
+        yield conn
+
+
+async def init_db():
+    """Initialize database schema."""
+    async with get_db_connection() as conn:
+        # No parameters, so the whole schema script goes out in one round-trip
+        await conn.execute(DB_SCHEMA)
+    logger.info("Database initialized")
 
 
 def extract_company(url: str, title: str) -> str:
     """Extract company name from Ashby URL or title."""
-    match = re.search(r'jobs\.ashbyhq\.com/([^/]+)', url)
+    match = ASHBY_COMPANY_RE.search(url)
     if match:
         company = match.group(1)
         return company.replace('-', ' ').title()
@@ -117,26 +276,123 @@ def extract_company(url: str, title: str) -> str:
     return ''
 
 
-async def search_google_playwright(query: str) -> list[dict]:
-    """Search Google using Playwright with stealth settings."""
-    results = []
+def load_checkpoint(query: str) -> tuple[int | None, set[int]]:
+    """Return (page size, saved result offsets) from a recent interrupted run of the same query."""
+    try:
+        with open(CHECKPOINT_FILE) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None, set()
+    if checkpoint.get('query') != query:
+        return None, set()
+    # Only resume a recent failure - a later scheduled run must re-fetch every page
+    if time.time() - checkpoint.get('saved_at', 0) > CHECKPOINT_MAX_AGE:
+        logger.info("Ignoring stale checkpoint")
+        return None, set()
+    return checkpoint.get('page_size'), set(checkpoint.get('completed_offsets', []))
+
+
+def save_checkpoint(query: str, page_size: int | None, completed_offsets: set[int]) -> None:
+    """Atomically record which result pages have been saved."""
+    tmp_path = CHECKPOINT_FILE + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'query': query,
+            'saved_at': time.time(),
+            'page_size': page_size,
+            'completed_offsets': sorted(completed_offsets),
+        }, f)
+    os.replace(tmp_path, CHECKPOINT_FILE)
+
+
+def clear_checkpoint() -> None:
+    """Forget progress once every page has been scraped."""
+    try:
+        os.remove(CHECKPOINT_FILE)
+    except FileNotFoundError:
+        pass
+
+
+async def block_resources(route) -> None:
+    """Abort requests for resource types we don't need (images, fonts, ...)."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def dismiss_consent(page, dismissed: asyncio.Event | None = None) -> None:
+    """Dismiss Google's consent/cookie popup if one is shown.
+    
+    `dismissed` is shared by pages of one context (and so one cookie jar): once
+    any of them accepts, the others skip the check.
+    """
+    if dismissed and dismissed.is_set():
+        return
+    
+    # One combined wait capped at 2s instead of one per selector
+    consent = page.locator(CONSENT_CONTAINER)
+    try:
+        await consent.locator(CONSENT_SELECTOR).first.wait_for(timeout=2000)
+    except PlaywrightTimeout:
+        return
+    
+    # Something is showing - click the highest-priority visible button
+    for selector in CONSENT_SELECTORS:
+        btn = consent.locator(f'{selector}:visible').first
+        if await btn.count():
+            await btn.click()
+            logger.info(f"Clicked consent button: {selector}")
+            if dismissed:
+                dismissed.set()
+            break
     
+    # Also try pressing Escape to dismiss any overlay
+    await page.keyboard.press('Escape')
+
+
+async def goto_with_backoff(page, url: str) -> None:
+    """Navigate to url, retrying with exponential backoff while Google blocks us."""
+    for attempt in range(MAX_BLOCKED_RETRIES + 1):
+        response = await page.goto(url, wait_until='domcontentloaded')
+        blocked = (
+            (response is not None and response.status == 429)
+            or 'sorry/index' in page.url
+            or await page.locator(CAPTCHA_SELECTOR).count() > 0
+        )
+        if not blocked:
+            return
+        if attempt == MAX_BLOCKED_RETRIES:
+            break
+        delay = min(60, 2 ** attempt) + random.uniform(0, 1)
+        logger.warning(f"Blocked by Google (CAPTCHA/429), retrying in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+    raise RuntimeError(f"Still blocked by Google after {MAX_BLOCKED_RETRIES} retries: {url}")
+
+
+async def search_google_playwright(query: str) -> tuple[int, int]:
+    """Search Google using Playwright with stealth settings and save the jobs found.
+    
+    Result pages are fetched concurrently, each in its own browser context, and
+    saved as soon as they're scraped. Returns (new_count, total_count).
+    """
     async with async_playwright() as p:
         # Connect to Browserless.io or launch local browser
         browserless_url = os.getenv('BROWSERLESS_URL')
+        cdp_url = os.getenv('CHROME_CDP_URL')
         chrome_path = os.getenv('CHROME_USER_DATA_DIR')
         context = None
         browser = None
+        keep_browser = False
         
-        if browserless_url:
+        if cdp_url:
+            # Long-lived local Chrome (see launch_browser_daemon.sh) - skips browser startup
+            logger.info(f"Connecting to running Chrome at {cdp_url}...")
+            browser = await p.chromium.connect_over_cdp(cdp_url)
+            keep_browser = True
+        elif browserless_url:
             logger.info("Connecting to Browserless...")
             browser = await p.chromium.connect_over_cdp(browserless_url)
-            context = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='en-US',
-                timezone_id='America/New_York',
-            )
         elif chrome_path and os.path.exists(chrome_path):
             profile = os.getenv('CHROME_PROFILE', 'Default')
             profile_path = os.path.join(chrome_path, profile)
@@ -151,6 +407,8 @@ async def search_google_playwright(query: str) -> list[dict]:
                     '--disable-blink-features=AutomationControlled',
                 ],
             )
+            await context.add_init_script(STEALTH_SCRIPT)
+            await context.route('**/*', block_resources)
         else:
             logger.info("Launching local Chromium (headless)...")
             logger.warning("⚠️  May hit CAPTCHA - set CHROME_USER_DATA_DIR for better results")
@@ -162,105 +420,156 @@ async def search_google_playwright(query: str) -> list[dict]:
                     '--no-sandbox',
                 ]
             )
-            context = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='en-US',
-                timezone_id='America/New_York',
-            )
         
-        # Add stealth scripts
-        await context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-            Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-            Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
-            window.chrome = { runtime: {} };
-        """)
+        async def new_context():
+            """Create a stealth context, or reuse the persistent profile context."""
+            if context:
+                return context
+            ctx = await browser.new_context(**CONTEXT_OPTIONS)
+            await ctx.add_init_script(STEALTH_SCRIPT)
+            await ctx.route('**/*', block_resources)
+            return ctx
+        
+        # Fresh contexts don't share cookies, so each must accept consent itself;
+        # only pages of the persistent profile context can skip after the first
+        consent_dismissed = asyncio.Event() if context else None
+        page_size, completed_offsets = load_checkpoint(query)
+        if completed_offsets:
+            logger.info(f"Resuming: {len(completed_offsets)} page(s) already saved")
         
-        page = await context.new_page()
+        saved_urls = set()
+        new_count = total_count = 0
+        
+        async def scrape_one(offset: int, num: int, sem: asyncio.Semaphore) -> tuple[int, bool]:
+            """Scrape and save one results page. Returns (organic results, has next page)."""
+            nonlocal new_count, total_count
+            page_label = f"page {offset // num + 1}"
+            url = f'https://www.google.com/search?q={quote_plus(query)}&num={num}&hl=en&start={offset}'
+            async with sem:
+                ctx = await new_context()
+                page = await ctx.new_page()
+                try:
+                    logger.info(f"Scraping {page_label}...")
+                    # networkidle can hang on Google's background pings - wait for the results instead
+                    await goto_with_backoff(page, url)
+                    await dismiss_consent(page, consent_dismissed)
+                    await page.wait_for_selector(RESULTS_SELECTOR, timeout=10000)
+                    
+                    page_results = await extract_search_results(page)
+                    organic, has_next = await page.evaluate(PAGE_INFO_SCRIPT)
+                    logger.info(f"Found {len(page_results)} results on {page_label}")
+                    
+                    # Persist each page as soon as it's scraped so a failed run can resume;
+                    # URLs already saved from another page this run are skipped
+                    page_jobs = []
+                    for job in dedupe_jobs(page_results):
+                        key = normalize_url(job['url'])
+                        if key not in saved_urls:
+                            saved_urls.add(key)
+                            job['search_rank'] += offset
+                            page_jobs.append(job)
+                    page_new, page_total = await save_jobs(page_jobs)
+                    new_count += page_new
+                    total_count += page_total
+                    completed_offsets.add(offset)
+                    save_checkpoint(query, page_size, completed_offsets)
+                    return organic, has_next
+                except Exception as e:
+                    logger.error(f"Error during scraping {page_label}: {e}")
+                    # Take screenshot for debugging
+                    await page.screenshot(path='error_screenshot.png')
+                    raise
+                finally:
+                    if ctx is context:
+                        await page.close()
+                    else:
+                        await ctx.close()
         
         try:
-            # Go to Google
-            await page.goto('https://www.google.com', wait_until='networkidle')
-            await asyncio.sleep(random.uniform(1, 2))
+            sem = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+            has_next = True
+            if page_size is None:
+                # The first page alone tells us whether Google honors num=; if it
+                # doesn't, 100-result offsets would silently skip results
+                organic, has_next = await scrape_one(0, RESULTS_PER_PAGE, sem)
+                page_size = RESULTS_PER_PAGE
+                if ignored_num(organic, has_next):
+                    logger.warning(
+                        f"Google returned {organic} results for num={RESULTS_PER_PAGE}, "
+                        f"falling back to {GOOGLE_PAGE_SIZE}-result pages"
+                    )
+                    page_size = GOOGLE_PAGE_SIZE
+                save_checkpoint(query, page_size, completed_offsets)
             
-            # Handle various consent/cookie popups (covers multiple languages)
-            consent_selectors = [
-                # English
-                'button:has-text("Accept all")',
-                'button:has-text("Accept")',
-                'button:has-text("I agree")',
-                'button:has-text("Agree")',
-                'button:has-text("Allow all")',
-                'button:has-text("Allow")',
-                'button:has-text("Got it")',
-                'button:has-text("OK")',
-                # Polish
-                'button:has-text("Zaakceptuj wszystko")',
-                'button:has-text("Akceptuję")',
-                'button:has-text("Zgadzam się")',
-                # Generic selectors
-                'button[id*="accept"]',
-                'button[aria-label*="Accept"]',
-                'div[role="dialog"] button:first-of-type',
-                '.QS5gu.sy4vM',  # Google's consent button class
+            max_pages = MAX_PAGES if page_size == RESULTS_PER_PAGE else FALLBACK_MAX_PAGES
+            offsets = [
+                page_num * page_size
+                for page_num in range(1, max_pages if has_next else 1)
+                if page_num * page_size not in completed_offsets
             ]
+            # TaskGroup cancels and awaits the other pages as soon as one fails, so
+            # nothing is still running when the browser and DB pool are torn down
+            async with asyncio.TaskGroup() as tg:
+                for offset in offsets:
+                    tg.create_task(scrape_one(offset, page_size, sem))
+            clear_checkpoint()
+        finally:
+            if context:
+                await context.close()
+            # Leave a shared daemon running for the next run; our contexts are already closed
+            if browser and not keep_browser:
+                await browser.close()
+    
+    return new_count, total_count
+
+
+async def search_via_serpapi(query: str) -> list[dict]:
+    """Search Google through SerpAPI's JSON API - no browser, no CAPTCHA handling."""
+    results = []
+    start = 0
+    max_pages = MAX_PAGES
+    
+    async with httpx.AsyncClient(timeout=15) as client:
+        page_num = 0
+        while page_num < max_pages:
+            logger.info(f"Fetching SerpAPI page {page_num + 1}...")
+            response = await client.get('https://serpapi.com/search', params={
+                'engine': 'google',
+                'q': query,
+                'num': RESULTS_PER_PAGE,
+                'start': start,
+                'hl': 'en',
+                'api_key': os.getenv('SERPAPI_KEY'),
+            })
+            # Not raise_for_status(): its message includes the URL, and with it the API key
+            if response.is_error:
+                raise RuntimeError(f"SerpAPI request failed with HTTP {response.status_code}")
             
-            for selector in consent_selectors:
-                try:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible(timeout=1000):
-                        await btn.click()
-                        logger.info(f"Clicked consent button: {selector}")
-                        await asyncio.sleep(1)
-                        break
-                except PlaywrightTimeout:
+            data = response.json()
+            organic = data.get('organic_results', [])
+            for item in organic:
+                url = item.get('link', '')
+                if not is_valid_job_url(url):
                     continue
+                title = item.get('title', '')
+                results.append({
+                    'url': url,
+                    'title': title,
+                    'company': extract_company(url, title),
+                    'description': item.get('snippet', ''),
+                    'search_rank': len(results) + 1,  # 1-based position
+                })
+            logger.info(f"Found {len(organic)} results on page {page_num + 1}")
             
-            # Also try pressing Escape to dismiss any overlay
-            await page.keyboard.press('Escape')
-            await asyncio.sleep(0.5)
-            
-            # Type search query - use fill() instead of click + type
-            search_box = page.locator('textarea[name="q"], input[name="q"]')
-            await search_box.fill(query, timeout=5000)
-            await asyncio.sleep(0.5)
-            
-            await page.keyboard.press('Enter')
-            await page.wait_for_load_state('networkidle')
-            
-            # Scrape multiple pages
-            for page_num in range(MAX_PAGES):
-                logger.info(f"Scraping page {page_num + 1}...")
-                await asyncio.sleep(random.uniform(2, 4))
-                
-                # Extract results from current page
-                page_results = await extract_search_results(page)
-                results.extend(page_results)
-                logger.info(f"Found {len(page_results)} results on page {page_num + 1}")
-                
-                # Try to go to next page
-                try:
-                    next_btn = page.locator('a#pnnext')
-                    if await next_btn.is_visible(timeout=3000):
-                        await next_btn.click()
-                        await page.wait_for_load_state('networkidle')
-                    else:
-                        logger.info("No more pages")
-                        break
-                except PlaywrightTimeout:
-                    logger.info("No next page found")
-                    break
-                    
-        except Exception as e:
-            logger.error(f"Error during scraping: {e}")
-            # Take screenshot for debugging
-            await page.screenshot(path='error_screenshot.png')
-            raise
-        finally:
-            await context.close()
-            if browser:
-                await browser.close()
+            next_url = data.get('serpapi_pagination', {}).get('next')
+            if not organic or not next_url:
+                logger.info("No more pages")
+                break
+            if page_num == 0 and ignored_num(len(organic), bool(next_url)):
+                # Default-size pages: same depth as the browser fallback
+                max_pages = FALLBACK_MAX_PAGES
+            start = int(parse_qs(urlparse(next_url).query).get('start', [start + len(organic)])[0])
+            page_num += 1
     
     return results
 
@@ -269,209 +578,188 @@ async def extract_search_results(page) -> list[dict]:
     """Extract job listings from Google search results page."""
     results = []
     
-    # Wait for page to settle
-    await asyncio.sleep(2)
-    
-    # Save screenshot for debugging
-    await page.screenshot(path='debug_search.png')
-    logger.info("Saved debug screenshot to debug_search.png")
-    
-    # Also log the current URL
+    # Log the current URL
     current_url = page.url
     logger.info(f"Current page URL: {current_url}")
     
-    # Get ALL links on the page and filter manually
-    all_links = await page.locator('a').all()
-    logger.info(f"Total links on page: {len(all_links)}")
+    # Pull every candidate link in a single round-trip and filter in Python
+    links = await page.evaluate(EXTRACT_LINKS_SCRIPT, list(JOB_DOMAINS))
+    logger.info(f"Candidate links on page: {len(links)}")
     
-    for link in all_links:
-        try:
-            href = await link.get_attribute('href')
-            if not href:
-                continue
-            
-            # Check if URL belongs to one of the allowed job board domains
-            if not is_valid_job_url(href):
-                continue
-            
-            logger.info(f"Raw href found: {href[:100]}...")
-            
-            # Extract real URL from Google redirect
-            real_url = href
-            if '/url?q=' in href or 'url?q=' in href:
-                try:
-                    from urllib.parse import unquote
-                    start = href.find('url?q=') + 6
-                    end = href.find('&', start) if '&' in href[start:] else len(href)
-                    real_url = unquote(href[start:end])
-                except:
-                    pass
-            
-            # Get all text content from the link element
-            full_text = await link.text_content()
-            
-            # Try to get title from h3 first
-            title = ''
-            try:
-                h3 = link.locator('h3').first
-                if await h3.count():
-                    title = await h3.text_content()
-            except:
-                pass
-            
-            # Fallback: first line of text
-            if not title and full_text:
-                title = full_text.strip().split('\n')[0]
-            
-            # Description: rest of the text or parent text
-            description = ''
-            if full_text:
-                lines = full_text.strip().split('\n')
-                if len(lines) > 1:
-                    description = ' '.join(lines[1:])
-            
-            # If no description from link, try parent element
-            if not description:
-                try:
-                    parent = link.locator('..')
-                    parent_text = await parent.text_content()
-                    if parent_text and parent_text != full_text:
-                        description = parent_text.replace(full_text, '').strip()[:500]
-                except:
-                    pass
-            
-            company = extract_company(real_url, title or '')
-            
-            logger.info(f"Found job: {title[:50] if title else 'No title'} at {company}")
-            
-            results.append({
-                'url': real_url,
-                'title': title.strip() if title else '',
-                'company': company,
-                'description': description.strip() if description else '',
-                'search_rank': len(results) + 1,  # 1-based position
-            })
-            
-        except Exception as e:
-            logger.debug(f"Error extracting result: {e}")
+    for link in links:
+        href = link['href']
+        
+        # Extract real URL from Google redirect
+        real_url = href
+        if href.startswith('/url?') or 'google.com/url?' in href:
+            # parse_qs unquotes, and won't split on encoded '&' inside the target URL
+            q = parse_qs(urlparse(href).query).get('q')
+            if q:
+                real_url = q[0]
+        
+        # Check if URL belongs to one of the allowed job board domains
+        if not is_valid_job_url(real_url):
             continue
+        
+        logger.info(f"Raw href found: {href[:100]}...")
+        
+        full_text = link['text']
+        
+        # Title from h3 first, fallback: first line of text
+        title = link['title']
+        if not title and full_text:
+            title = full_text.strip().split('\n')[0]
+        
+        # Description: rest of the text or the result's snippet
+        description = ''
+        if full_text:
+            lines = full_text.strip().split('\n')
+            if len(lines) > 1:
+                description = ' '.join(lines[1:])
+        
+        if not description:
+            description = link['snippet'][:500]
+        
+        company = extract_company(real_url, title or '')
+        
+        logger.info(f"Found job: {title[:50] if title else 'No title'} at {company}")
+        
+        results.append({
+            'url': real_url,
+            'title': title.strip() if title else '',
+            'company': company,
+            'description': description.strip() if description else '',
+            'search_rank': len(results) + 1,  # 1-based position
+        })
+    
+    if not results:
+        # Save screenshot for debugging
+        await page.screenshot(path='debug_search.png')
+        logger.info("Saved debug screenshot to debug_search.png")
     
     return results
 
 
-def save_jobs(jobs: list[dict]) -> tuple[int, int]:
+async def save_jobs(jobs: list[dict]) -> tuple[int, int]:
     """Save jobs to database. Returns (new_count, total_count)."""
     if not jobs:
         return 0, 0
     
-    new_count = 0
+    # One row per normalized url - ON CONFLICT can't touch the same row twice in a statement
+    rows_by_url = {}
+    for job in jobs:
+        rows_by_url[normalize_url(job['url'])] = (
+            job['url'],
+            job['title'],
+            job['company'],
+            job['description'],
+            job['search_rank'],
+        )
+    rows = list(rows_by_url.values())
     
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            for job in jobs:
-                url_hash = hash_url(job['url'])
-                try:
-                    # Check if exists
-                    cur.execute(
-                        "SELECT id FROM jobs WHERE url_hash = %s",
-                        (url_hash,)
-                    )
-                    exists = cur.fetchone()
-                    
-                    if exists:
-                        # Update existing - update rank and last_seen
-                        cur.execute("""
-                            UPDATE jobs SET
-                                title = %s,
-                                description = %s,
-                                search_rank = %s,
-                                last_seen_at = CURRENT_TIMESTAMP,
-                                is_active = TRUE
-                            WHERE url_hash = %s
-                        """, (job['title'], job['description'], job['search_rank'], url_hash))
-                    else:
-                        # Insert new
-                        cur.execute("""
-                            INSERT INTO jobs (url, url_hash, title, company, description, search_rank)
-                            VALUES (%s, %s, %s, %s, %s, %s)
-                        """, (
-                            job['url'],
-                            url_hash,
-                            job['title'],
-                            job['company'],
-                            job['description'],
-                            job['search_rank'],
-                        ))
-                        new_count += 1
-                        logger.info(f"✨ New job: {job['title']} at {job['company']} (rank #{job['search_rank']})")
-                        
-                except psycopg2.Error as e:
-                    logger.error(f"Error saving job {job['url']}: {e}")
-                    
-        conn.commit()
+    async with get_db_connection() as conn:
+        async with conn.cursor() as cur:
+            if len(rows) >= COPY_THRESHOLD:
+                # Bulk load: COPY into a temp table, then a single INSERT ... SELECT
+                # (rows are already unique by normalized url, see above)
+                await cur.execute("""
+                    CREATE TEMP TABLE tmp_jobs (
+                        url TEXT,
+                        title TEXT,
+                        company TEXT,
+                        description TEXT,
+                        search_rank INTEGER
+                    ) ON COMMIT DROP
+                """)
+                async with cur.copy(
+                    "COPY tmp_jobs (url, title, company, description, search_rank) FROM STDIN"
+                ) as copy:
+                    for row in rows:
+                        await copy.write_row(row)
+                await cur.execute(f"""
+                    INSERT INTO jobs (url, title, company, description, search_rank)
+                    SELECT url, title, company, description, search_rank
+                    FROM tmp_jobs
+                    {UPSERT_CONFLICT_SQL}
+                """)
+                saved = await cur.fetchall()
+            else:
+                # Insert new / update existing (rank and last_seen); pipeline mode sends
+                # every row without waiting for each server ack
+                async with conn.pipeline():
+                    await cur.executemany(f"""
+                        INSERT INTO jobs (url, title, company, description, search_rank)
+                        VALUES (%s, %s, %s, %s, %s)
+                        {UPSERT_CONFLICT_SQL}
+                    """, rows, returning=True)
+                
+                saved = []
+                while True:
+                    saved.append(await cur.fetchone())
+                    if not cur.nextset():
+                        break
+    
+    new_count = 0
+    for inserted, title, company, search_rank in saved:
+        if inserted:
+            new_count += 1
+            logger.info(f"✨ New job: {title} at {company} (rank #{search_rank})")
     
     return new_count, len(jobs)
 
 
-def get_recent_jobs(days: int = 7) -> list[dict]:
+async def get_recent_jobs(days: int = 7) -> list[dict]:
     """Get jobs discovered in the last N days."""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
+    async with get_db_connection() as conn:
+        # Server-side cursor streams rows in batches; dict_row builds the dicts
+        async with conn.cursor(name='recent_jobs', row_factory=dict_row) as cur:
+            cur.itersize = 500
+            await cur.execute("""
                 SELECT url, title, company, description, discovered_at
                 FROM jobs
-                WHERE discovered_at > NOW() - INTERVAL '%s days'
+                WHERE discovered_at > NOW() - make_interval(days => %s::int)
                   AND is_active = TRUE
                 ORDER BY discovered_at DESC
             """, (days,))
             
-            columns = ['url', 'title', 'company', 'description', 'discovered_at']
-            return [dict(zip(columns, row)) for row in cur.fetchall()]
+            return [row async for row in cur]
 
 
 async def main():
     """Main entry point."""
-    logger.info("🚀 Starting job scraper...")
-    
-    # Initialize database
-    init_db()
-    
-    # Search for jobs
-    logger.info(f"🔍 Searching: {SEARCH_QUERY}")
-    jobs = await search_google_playwright(SEARCH_QUERY)
-    
-    # Deduplicate by URL and filter valid job board URLs only
-    seen = set()
-    unique_jobs = []
-    rank = 0
-    for job in jobs:
-        url = job['url']
-        if url not in seen and is_valid_job_url(url):
-            seen.add(url)
-            rank += 1
-            job['search_rank'] = rank  # Re-assign rank after filtering
-            unique_jobs.append(job)
-    
-    logger.info(f"📋 Found {len(unique_jobs)} unique results")
-    
-    # Save to database
-    new_count, total = save_jobs(unique_jobs)
-    logger.info(f"💾 Processed {total} jobs, {new_count} new")
-    
-    # Show recent jobs
-    recent = get_recent_jobs(days=1)
-    if recent:
-        print(f"\n{'='*60}")
-        print(f"Jobs discovered today ({len(recent)}):")
-        print('='*60)
-        for job in recent:
-            print(f"\n📌 {job['title']}")
-            print(f"   🏢 {job['company']}")
-            if job.get('description'):
-                print(f"   📝 {job['description']}")
-            print(f"   🔗 {job['url']}")
-    
-    return new_count
+    try:
+        logger.info("🚀 Starting job scraper...")
+        
+        # Initialize database
+        await init_db()
+        
+        # Search for jobs
+        logger.info(f"🔍 Searching: {SEARCH_QUERY}")
+        if os.getenv('SERPAPI_KEY'):
+            jobs = dedupe_jobs(await search_via_serpapi(SEARCH_QUERY))
+            logger.info(f"📋 Found {len(jobs)} unique results")
+            new_count, total = await save_jobs(jobs)
+        else:
+            # Pages are saved as they're scraped so an interrupted run can resume
+            new_count, total = await search_google_playwright(SEARCH_QUERY)
+        logger.info(f"💾 Processed {total} jobs, {new_count} new")
+        
+        # Show recent jobs
+        recent = await get_recent_jobs(days=1)
+        if recent:
+            print(f"\n{'='*60}")
+            print(f"Jobs discovered today ({len(recent)}):")
+            print('='*60)
+            for job in recent:
+                print(f"\n📌 {job['title']}")
+                print(f"   🏢 {job['company']}")
+                if job.get('description'):
+                    print(f"   📝 {job['description']}")
+                print(f"   🔗 {job['url']}")
+        
+        return new_count
+    finally:
+        await close_db_pool()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,25 @@
+#!/usr/bin/env bash
+# Start a long-lived headless Chrome that job_scraper.py can attach to via
+# CHROME_CDP_URL=http://localhost:9222, skipping browser startup on each run.
+#
+# Usage:
+#     ./launch_browser_daemon.sh
+#
+# Environment variables (optional):
+#     CHROME_BIN  - Chrome/Chromium executable (default: chromium)
+#     CDP_PORT    - remote debugging port (default: 9222)
+
+set -euo pipefail
+
+CHROME_BIN="${CHROME_BIN:-chromium}"
+CDP_PORT="${CDP_PORT:-9222}"
+
+"$CHROME_BIN" \
+    --headless=new \
+    --remote-debugging-port="$CDP_PORT" \
+    --user-data-dir=/tmp/scraper-profile \
+    --disable-blink-features=AutomationControlled \
+    --disable-dev-shm-usage \
+    >/dev/null 2>&1 &
+
+echo "Chrome running (pid $!) - export CHROME_CDP_URL=http://localhost:$CDP_PORT"